@@ -1,13 +1,51 @@
+import math
+
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 from scheduler import run_scheduler, Task
 
 st.set_page_config(page_title="RTOS Simulator Pro", layout="wide")
 
+# Status colors for the Gantt chart (built once at import, not per run)
+COLOR_MAP = {
+    "Running": "#4CAF50",   # Green
+    "Idle": "#EEEEEE",      # Light Grey
+    "Missed": "#FF5252",    # Red
+    "Server Exec": "#2196F3", # Blue
+    "Background": "#9C27B0"   # Purple
+}
+
+# --- CACHED SIMULATION ---
+# Keyed on hashable task tuples so reruns with unchanged inputs skip the
+# whole O(hyperperiod) simulation and return the memoized result.
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_run(periodic_key, aperiodic_key, algorithm, num_cpus, server_mode, s_cap, s_period, max_time=None):
+    periodic = [
+        Task(name=n, task_type="Periodic", cost=c, period=p, deadline=d, arrival=a)
+        for (n, c, p, d, a) in periodic_key
+    ]
+    aperiodic = [
+        Task(name=n, task_type="Aperiodic", cost=c, period=0, deadline=0, arrival=a)
+        for (n, c, a) in aperiodic_key
+    ]
+    return run_scheduler(periodic, aperiodic, algorithm, num_cpus, server_mode, s_cap, s_period, max_time=max_time)
+
+def _periodic_key():
+    return tuple((t.name, t.cost, t.period, t.deadline, t.arrival_time) for t in st.session_state.periodic_list)
+
+def _aperiodic_key():
+    return tuple((t.name, t.cost, t.arrival_time) for t in st.session_state.aperiodic_list)
+
 # Session State Init
 if 'periodic_list' not in st.session_state: st.session_state.periodic_list = []
 if 'aperiodic_list' not in st.session_state: st.session_state.aperiodic_list = []
+# Pre-built display rows, updated only when tasks are added/cleared so the
+# render path doesn't rebuild the tables on every rerun
+if 'periodic_rows' not in st.session_state: st.session_state.periodic_rows = []
+if 'aperiodic_rows' not in st.session_state: st.session_state.aperiodic_rows = []
+# Default-name counters, bumped only when a task is actually added
+if 'next_p_id' not in st.session_state: st.session_state.next_p_id = 1
+if 'next_a_id' not in st.session_state: st.session_state.next_a_id = 1
 
 st.title("⚡ Advanced RTOS Simulator")
 
@@ -38,19 +76,24 @@ with st.sidebar:
 tab1, tab2 = st.tabs(["🔄 Periodic Tasks", "⚡ Aperiodic Tasks"])
 
 with tab1:
-    c1, c2, c3, c4, c5 = st.columns(5)
-    p_name = c1.text_input("Task Name", f"T{len(st.session_state.periodic_list)+1}")
-    p_cost = c2.number_input("Exec Time (C)", 1, 20, 1, key="pc")
-    p_period = c3.number_input("Period (T)", 2, 50, 5, key="pp")
-    
-    # Optional Inputs
-    use_custom_r = c4.checkbox("Release Time?", value=False)
-    p_release = c4.number_input("Release (r)", 0, 50, 0, disabled=not use_custom_r, key="pr")
-    
-    use_custom_d = c5.checkbox("Deadline?", value=False)
-    p_deadline = c5.number_input("Deadline (D)", 1, 50, 5, disabled=not use_custom_d, key="pd")
-    
-    if st.button("Add Periodic Task"):
+    # Batched in a form: editing the five inputs no longer triggers a script
+    # rerun per keystroke/click — only the submit does
+    with st.form("add_periodic"):
+        c1, c2, c3, c4, c5 = st.columns(5)
+        p_name = c1.text_input("Task Name", f"T{st.session_state.next_p_id}")
+        p_cost = c2.number_input("Exec Time (C)", 1, 20, 1, key="pc")
+        p_period = c3.number_input("Period (T)", 2, 50, 5, key="pp")
+
+        # Optional Inputs (the checkbox decides whether the value is used)
+        use_custom_r = c4.checkbox("Release Time?", value=False)
+        p_release = c4.number_input("Release (r)", 0, 50, 0, key="pr")
+
+        use_custom_d = c5.checkbox("Deadline?", value=False)
+        p_deadline = c5.number_input("Deadline (D)", 1, 50, 5, key="pd")
+
+        submitted_p = st.form_submit_button("Add Periodic Task")
+
+    if submitted_p:
         # Handle defaults
         final_deadline = p_deadline if use_custom_d else 0 # 0 tells scheduler to use Period
         final_release = p_release if use_custom_r else 0
@@ -65,30 +108,35 @@ with tab1:
             arrival=final_release
         )
         st.session_state.periodic_list.append(new_task)
+        st.session_state.periodic_rows.append({
+            "Name": new_task.name, "Cost": new_task.cost, "Period": new_task.period,
+            "Release": new_task.arrival_time,
+            "Deadline": new_task.deadline if new_task.deadline > 0 else new_task.period
+        })
+        st.session_state.next_p_id += 1
         st.success(f"Added {p_name}")
 
     if st.session_state.periodic_list:
         st.write("---")
         # Display as a clean table
-        display_data = []
-        for t in st.session_state.periodic_list:
-            display_data.append({
-                "Name": t.name, "Cost": t.cost, "Period": t.period, 
-                "Release": t.arrival_time, "Deadline": t.deadline if t.deadline > 0 else t.period
-            })
-        st.dataframe(display_data)
-        
+        st.dataframe(st.session_state.periodic_rows)
+
         if st.button("Clear Periodic"):
             st.session_state.periodic_list = []
+            st.session_state.periodic_rows = []
+            st.session_state.next_p_id = 1
             st.rerun()
 
 with tab2:
-    c1, c2, c3 = st.columns(3)
-    a_name = c1.text_input("Job Name", f"J{len(st.session_state.aperiodic_list)+1}")
-    a_arrival = c2.number_input("Arrival Time (r)", 0, 50, 2)
-    a_cost = c3.number_input("Exec Time (C)", 1, 10, 1, key="ac")
-    
-    if st.button("Add Aperiodic Job"):
+    with st.form("add_aperiodic"):
+        c1, c2, c3 = st.columns(3)
+        a_name = c1.text_input("Job Name", f"J{st.session_state.next_a_id}")
+        a_arrival = c2.number_input("Arrival Time (r)", 0, 50, 2)
+        a_cost = c3.number_input("Exec Time (C)", 1, 10, 1, key="ac")
+
+        submitted_a = st.form_submit_button("Add Aperiodic Job")
+
+    if submitted_a:
         # CORRECTED CALL
         new_job = Task(
             name=a_name, 
@@ -99,17 +147,20 @@ with tab2:
             arrival=a_arrival
         )
         st.session_state.aperiodic_list.append(new_job)
+        st.session_state.aperiodic_rows.append({
+            "Name": new_job.name, "Arrival": new_job.arrival_time, "Cost": new_job.cost
+        })
+        st.session_state.next_a_id += 1
         st.success(f"Added {a_name}")
 
     if st.session_state.aperiodic_list:
         st.write("---")
-        display_data_ap = []
-        for t in st.session_state.aperiodic_list:
-            display_data_ap.append({"Name": t.name, "Arrival": t.arrival_time, "Cost": t.cost})
-        st.dataframe(display_data_ap)
-        
+        st.dataframe(st.session_state.aperiodic_rows)
+
         if st.button("Clear Aperiodic"):
             st.session_state.aperiodic_list = []
+            st.session_state.aperiodic_rows = []
+            st.session_state.next_a_id = 1
             st.rerun()
 
 # --- SIMULATION TRIGGER ---
@@ -119,63 +170,83 @@ st.divider()
 # app.py (Bottom Section)
 
 if st.button("🚀 RUN SIMULATION", type="primary", use_container_width=True):
-    
-    results, queue_log = run_scheduler(
-        st.session_state.periodic_list,
-        st.session_state.aperiodic_list,
-        algorithm,
-        num_cpus,
-        server_mode,
-        s_cap,
-        s_period
-    )
-    
+
+    # Deferred: Plotly is heavy and only needed once a simulation runs,
+    # while Streamlit re-executes this whole script on every widget change
+    import plotly.express as px
+
+    # Schedulability pre-check: if the periodic load alone over-commits the
+    # processors the set is unschedulable under any of these algorithms, so
+    # don't burn the whole hyperperiod — a short window shows the misses.
+    periodic = st.session_state.periodic_list
+    utilization = sum(t.cost / t.period for t in periodic)
+    max_time = None
+    if periodic and utilization > num_cpus:
+        max_time = 2 * max(t.period for t in periodic)
+        st.warning(
+            f"Utilization {utilization:.2f} exceeds the capacity of {num_cpus} CPU(s) — "
+            f"task set is unschedulable, simulating only the first {max_time} ticks."
+        )
+
+    sim_key = (_periodic_key(), _aperiodic_key(), algorithm, num_cpus, server_mode, s_cap, s_period, max_time)
+    results, queue_log = _cached_run(*sim_key)
+
     if results:
         df = pd.DataFrame(results)
-        
+
+        # Shrink dtypes: int64 -> int32 for the tick columns, and
+        # dictionary-encode the repetitive label columns. Halves the memory
+        # traffic for the filtering below and for Arrow serialization.
+        df[['Start', 'Finish', 'Duration']] = df[['Start', 'Finish', 'Duration']].astype('int32')
+        df[['Task', 'Status']] = df[['Task', 'Status']].astype('category')
+
+
         # --- CHART FIX: Use px.bar instead of px.timeline ---
         st.subheader("Gantt Chart")
-        
-        # 1. Calculate Duration (Required for px.bar)
-        df['Duration'] = df['Finish'] - df['Start']
-        
-        color_map = {
-            "Running": "#4CAF50",   # Green
-            "Idle": "#EEEEEE",      # Light Grey
-            "Missed": "#FF5252",    # Red
-            "Server Exec": "#2196F3", # Blue
-            "Background": "#9C27B0"   # Purple
-        }
-        
-        # 2. Draw using Horizontal Bar Chart
-        fig = px.bar(
-            df, 
-            x="Duration", 
-            y="CPU",          # Puts the bar on the correct CPU row
-            base="Start",     # Tells Plotly where to start the bar
-            color="Status", 
-            text="Task",      # Show Task Name inside the bar
-            facet_row="CPU",  # Splits the chart into rows (CPU 1, CPU 2)
-            orientation='h',  # Horizontal
-            color_discrete_map=color_map,
-            height=200 * num_cpus if num_cpus > 1 else 300
-        )
-        
-        # 3. Clean up Layout
-        fig.update_layout(
-            xaxis_title="Time (Ticks)",
-            yaxis_title="",
-            showlegend=True,
-            bargap=0.1 # Make bars thicker
-        )
-        
-        # Force X-axis to show every single integer tick
-        fig.update_xaxes(type='linear', dtick=1)
-        
-        # Ensure Y-axes across all facets share the same category order
-        fig.update_yaxes(matches=None, showticklabels=True)
-        
-        st.plotly_chart(fig, use_container_width=True)
+
+        # Reuse the previously built figure when the inputs are unchanged —
+        # px.bar construction plus figure serialization is the expensive
+        # part of a rerun once the simulation itself is cached.
+        if st.session_state.get('fig_key') == sim_key:
+            fig = st.session_state['fig']
+        else:
+            # Idle slots carry no scheduling information but each one still
+            # becomes a bar (and SVG nodes) — mask them out before plotting
+            chart_df = df[df['Status'].values != 'Idle']
+
+            # 2. Draw using Horizontal Bar Chart
+            fig = px.bar(
+                chart_df,
+                x="Duration",
+                y="CPU",          # Puts the bar on the correct CPU row
+                base="Start",     # Tells Plotly where to start the bar
+                color="Status",
+                text="Task",      # Show Task Name inside the bar
+                orientation='h',  # Horizontal
+                color_discrete_map=COLOR_MAP,
+                height=100 + 60 * num_cpus
+            )
+
+            # 3. Clean up Layout
+            fig.update_layout(
+                xaxis_title="Time (Ticks)",
+                yaxis_title="",
+                showlegend=True,
+                bargap=0.1, # Make bars thicker
+                uirevision='gantt' # Keep zoom/pan and skip full re-layout on rerun
+            )
+
+            # Integer ticks, but cap the tick count so long hyperperiods don't
+            # flood the browser with thousands of tick labels (chart_end, not
+            # max_time: that name is the truncation horizon in the sim key)
+            chart_end = int(df['Finish'].max())
+            tick_step = 1 if chart_end <= 50 else math.ceil(chart_end / 50)
+            fig.update_xaxes(type='linear', dtick=tick_step)
+
+            st.session_state['fig'] = fig
+            st.session_state['fig_key'] = sim_key
+
+        st.plotly_chart(fig, use_container_width=True, key="gantt")
         
         # --- LOG TABLE ---
         st.divider()
@@ -187,7 +258,15 @@ if st.button("🚀 RUN SIMULATION", type="primary", use_container_width=True):
         cols = ["Time"] + [f"CPU {i+1}" for i in range(num_cpus)] + ["Waiting Queue"]
         # Filter to make sure we only grab columns that actually exist
         final_cols = [c for c in cols if c in queue_df.columns]
-        
+
+        # The CPU columns repeat a handful of task labels; categorical dtype
+        # lets the Arrow transfer dictionary-encode them instead of shipping
+        # one string object per cell
+        for c in final_cols:
+            if c.startswith("CPU"):
+                queue_df[c] = queue_df[c].astype('category')
+
+
         st.dataframe(
             queue_df[final_cols], 
             use_container_width=True,
@@ -1,73 +1,112 @@
+import re
 import tkinter as tk
 from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+from concurrent.futures import ThreadPoolExecutor
 
 from scheduler import Task,run_scheduler
 # --- Global list to hold tasks ---
-# 1. Create dummy tasks
-t1 = Task("T1", 0, 1, 4, 4) # Cost 1, Period 4
-t2 = Task("T2", 0, 2, 6, 6) # Cost 2, Period 6
-
-print("--- Starting Simulation (Rate Monotonic) ---")
-results = run_scheduler([t1, t2], "Rate Monotonic")
 tasks = []
 
+# Pre-compiled integer check: validating up front avoids raising (and
+# catching) a ValueError per miskeyed field and gives one combined message
+_INT_RE = re.compile(r'^-?\d+$')
+
 def add_task():
-    try:
-        n = name_entry.get()
-        c = int(cost_entry.get())
-        p = int(period_entry.get())
-        d = int(deadline_entry.get())
-        
-        # Create Task and add to list
-        new_task = Task(n, 0, c, p, d)
-        tasks.append(new_task)
-        
-        # Update listbox
-        task_listbox.insert(tk.END, f"{n}: Cost={c}, Period={p}, Deadline={d}")
-        
-        # Clear inputs
-        name_entry.delete(0, tk.END)
-    except ValueError:
-        messagebox.showerror("Input Error", "Please enter valid numbers for Cost/Period/Deadline")
+    n = name_entry.get()
+    fields = {
+        "Cost": cost_entry.get().strip(),
+        "Period": period_entry.get().strip(),
+        "Deadline": deadline_entry.get().strip(),
+    }
+    bad = [k for k, v in fields.items() if not _INT_RE.match(v)]
+    if bad:
+        messagebox.showerror("Input Error", f"Please enter valid numbers for: {', '.join(bad)}")
+        return
+
+    c, p, d = int(fields["Cost"]), int(fields["Period"]), int(fields["Deadline"])
+
+    # Create Task and add to list
+    new_task = Task(n, 0, c, p, d)
+    tasks.append(new_task)
+
+    # Update listbox
+    task_listbox.insert(tk.END, f"{n}: Cost={c}, Period={p}, Deadline={d}")
+
+    # Clear inputs
+    name_entry.delete(0, tk.END)
 
 def clear_tasks():
     tasks.clear()
     task_listbox.delete(0, tk.END)
 
+# Single worker: one simulation at a time, off the Tk thread so the
+# window stays responsive during long hyperperiods
+_executor = ThreadPoolExecutor(max_workers=1)
+
 def run_simulation():
     if not tasks:
         messagebox.showwarning("No Tasks", "Please add at least one task.")
         return
 
     algo = algo_combo.get()
-    
-    # 1. Run the Scheduler Logic
-    timeline = run_scheduler(tasks, algo)
-    
+
+    # 1. Run the Scheduler Logic on the worker thread
+    run_btn.configure(state="disabled", text="Running...")
+    future = _executor.submit(run_scheduler, list(tasks), [], algo, 1)
+    _poll_result(future)
+
+def _poll_result(future):
+    # Poll instead of blocking: Tk widgets must only be touched from the
+    # main thread, so the worker's result is picked up via root.after
+    if not future.done():
+        root.after(50, _poll_result, future)
+        return
+
+    run_btn.configure(state="normal", text="RUN SIMULATION")
+    timeline, _queue_log = future.result()
+
     # 2. Draw with Matplotlib
     draw_gantt_chart(timeline)
 
+# Reused across simulations so re-runs redraw into the existing window
+# instead of rasterizing a fresh figure (and popping a new one) each time
+_gantt_fig = None
+
 def draw_gantt_chart(timeline):
     """
-    Draws a Gantt chart using Matplotlib in a new popup window
+    Draws a Gantt chart using Matplotlib in a popup window (reused if open)
     """
+    # Deferred import: matplotlib costs ~0.5-1s (NumPy, font cache scan)
+    # and is only needed once a simulation is actually run
+    import matplotlib.pyplot as plt
+
+    global _gantt_fig
+
     if not timeline:
         messagebox.showinfo("Result", "No timeline generated.")
         return
 
-    fig, gnt = plt.subplots(figsize=(10, 5))
-    
+    if _gantt_fig is not None and plt.fignum_exists(_gantt_fig.number):
+        fig = _gantt_fig
+        gnt = fig.axes[0]
+        gnt.clear()
+    else:
+        fig, gnt = plt.subplots(figsize=(10, 5))
+        _gantt_fig = fig
+
     # Setup X and Y axes
-    simulation_time = timeline[-1]['Finish'] # Get last finish time
+    # Max, not timeline[-1]: a zero-width Missed marker appended after an
+    # in-place-extended slot can be the last element and would clip the axis
+    simulation_time = max(item['Finish'] for item in timeline)
     gnt.set_xlim(0, simulation_time)
     gnt.set_xlabel('Time')
     gnt.set_ylabel('Tasks')
     
     # Set Y-ticks to show Task Names
-    # Get unique task names from the timeline
-    task_names = sorted(list(set(item['Task'] for item in timeline if item['Task'] != 'System')))
+    # Unique task names in one C-level set pass; IDLE gets no row of its own
+    task_names = sorted({item['Task'] for item in timeline if item['Task'] not in ('System', 'IDLE')})
+    # One dict build replaces a task_names.index() linear scan per group
+    y_map = {name: 10 + 10 * i for i, name in enumerate(task_names)}
     yticks = [15 + 10 * i for i in range(len(task_names))]
     gnt.set_yticks(yticks)
     gnt.set_yticklabels(task_names)
@@ -76,74 +115,96 @@ def draw_gantt_chart(timeline):
     # Colors for different statuses
     colors = {'Running': 'tab:blue', 'Idle': 'tab:gray', 'Missed': 'tab:red'}
 
-    # Draw the bars
+    # Group the slots by (task, status) first: one broken_barh call per
+    # group draws a single collection instead of one Rectangle artist per
+    # time slot, which dominates redraw time for long hyperperiods
+    segments = {}
     for item in timeline:
         task_name = item['Task']
-        start = item['Start']
-        duration = item['Finish'] - item['Start']
-        status = item['Status']
-        
-        if task_name == 'System': continue # Skip the dummy system block if present
-
-        # Calculate Y position based on task name index
-        y_pos = 10 + 10 * task_names.index(task_name)
-        
-        gnt.broken_barh([(start, duration)], (y_pos, 9), facecolors=colors.get(status, 'blue'))
-        
-        # Add text label inside the bar
-        gnt.text(start + duration/2, y_pos + 4.5, str(duration), color='white', ha='center', va='center')
-
-    plt.title(f"Scheduling Schedule")
+        if task_name in ('System', 'IDLE'): continue # Skip dummy/idle blocks
+        key = (task_name, item['Status'])
+        segments.setdefault(key, []).append((item['Start'], item['Finish'] - item['Start']))
+
+    # Hoist the method/dict lookups out of the hot loop
+    _broken_barh, _text, _color_get = gnt.broken_barh, gnt.text, colors.get
+
+    for (task_name, status), segs in segments.items():
+        y_pos = y_map[task_name]
+
+        _broken_barh(segs, (y_pos, 9), facecolors=_color_get(status, 'blue'))
+
+        # Add text label inside each bar
+        for start, duration in segs:
+            _text(start + duration * 0.5, y_pos + 4.5, str(duration), color='white', ha='center', va='center')
+
+    gnt.set_title("Scheduling Schedule")
+    fig.canvas.draw_idle()
     plt.show()
 
 # --- MAIN WINDOW SETUP ---
-root = tk.Tk()
-root.title("RTOS Scheduler (Tkinter)")
-root.geometry("400x500")
+def main():
+    # Widgets stay module-global so the callbacks above can reach them,
+    # but nothing is built (and no Tk root is created) on import anymore
+    global root, name_entry, cost_entry, period_entry, deadline_entry
+    global task_listbox, algo_combo, run_btn
+
+    root = tk.Tk()
+    # Hidden while the widget tree is assembled: each pack/grid below would
+    # otherwise trigger a visible relayout pass on the mapped window
+    root.withdraw()
+    root.title("RTOS Scheduler (Tkinter)")
+    root.geometry("400x500")
+
+    # Input Frame
+    input_frame = ttk.LabelFrame(root, text="New Task")
+    input_frame.pack(padx=10, pady=10, fill="x")
+
+    ttk.Label(input_frame, text="Name:").grid(row=0, column=0)
+    name_entry = ttk.Entry(input_frame, width=10)
+    name_entry.grid(row=0, column=1)
 
-# Input Frame
-input_frame = ttk.LabelFrame(root, text="New Task")
-input_frame.pack(padx=10, pady=10, fill="x")
+    ttk.Label(input_frame, text="Cost (C):").grid(row=0, column=2)
+    cost_entry = ttk.Entry(input_frame, width=5)
+    cost_entry.grid(row=0, column=3)
 
-ttk.Label(input_frame, text="Name:").grid(row=0, column=0)
-name_entry = ttk.Entry(input_frame, width=10)
-name_entry.grid(row=0, column=1)
+    ttk.Label(input_frame, text="Period (T):").grid(row=1, column=0)
+    period_entry = ttk.Entry(input_frame, width=5)
+    period_entry.grid(row=1, column=1)
 
-ttk.Label(input_frame, text="Cost (C):").grid(row=0, column=2)
-cost_entry = ttk.Entry(input_frame, width=5)
-cost_entry.grid(row=0, column=3)
+    ttk.Label(input_frame, text="Deadline (D):").grid(row=1, column=2)
+    deadline_entry = ttk.Entry(input_frame, width=5)
+    deadline_entry.grid(row=1, column=3)
 
-ttk.Label(input_frame, text="Period (T):").grid(row=1, column=0)
-period_entry = ttk.Entry(input_frame, width=5)
-period_entry.grid(row=1, column=1)
+    add_btn = ttk.Button(input_frame, text="Add Task", command=add_task)
+    add_btn.grid(row=2, column=0, columnspan=4, pady=5)
 
-ttk.Label(input_frame, text="Deadline (D):").grid(row=1, column=2)
-deadline_entry = ttk.Entry(input_frame, width=5)
-deadline_entry.grid(row=1, column=3)
+    # Task List
+    list_frame = ttk.LabelFrame(root, text="Current Tasks")
+    list_frame.pack(padx=10, pady=5, fill="both", expand=True)
 
-add_btn = ttk.Button(input_frame, text="Add Task", command=add_task)
-add_btn.grid(row=2, column=0, columnspan=4, pady=5)
+    task_listbox = tk.Listbox(list_frame, height=10)
+    task_listbox.pack(fill="both", expand=True, padx=5, pady=5)
 
-# Task List
-list_frame = ttk.LabelFrame(root, text="Current Tasks")
-list_frame.pack(padx=10, pady=5, fill="both", expand=True)
+    clear_btn = ttk.Button(list_frame, text="Clear All", command=clear_tasks)
+    clear_btn.pack(pady=5)
 
-task_listbox = tk.Listbox(list_frame, height=10)
-task_listbox.pack(fill="both", expand=True, padx=5, pady=5)
+    # Control Frame
+    control_frame = ttk.Frame(root)
+    control_frame.pack(fill="x", padx=10, pady=10)
 
-clear_btn = ttk.Button(list_frame, text="Clear All", command=clear_tasks)
-clear_btn.pack(pady=5)
+    ttk.Label(control_frame, text="Algorithm:").pack(side="left")
+    algo_combo = ttk.Combobox(control_frame, values=["Rate Monotonic", "EDF"])
+    algo_combo.current(0)
+    algo_combo.pack(side="left", padx=5)
 
-# Control Frame
-control_frame = ttk.Frame(root)
-control_frame.pack(fill="x", padx=10, pady=10)
+    run_btn = ttk.Button(control_frame, text="RUN SIMULATION", command=run_simulation)
+    run_btn.pack(side="right")
 
-ttk.Label(control_frame, text="Algorithm:").pack(side="left")
-algo_combo = ttk.Combobox(control_frame, values=["Rate Monotonic", "EDF"])
-algo_combo.current(0)
-algo_combo.pack(side="left", padx=5)
+    # Show the window only after the layout has settled in one pass
+    root.update_idletasks()
+    root.deiconify()
 
-run_btn = ttk.Button(control_frame, text="RUN SIMULATION", command=run_simulation)
-run_btn.pack(side="right")
+    root.mainloop()
 
-root.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
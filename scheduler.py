@@ -1,8 +1,35 @@
+import heapq
 import math
-import copy
-from functools import reduce
+import warnings
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import count
+
+import numpy as np
+
+# Priority keys: a ready task's key never changes while its job is pending
+# and it stays off the CPU, so the ready queue can live in a heap that is
+# pushed on arrival (and refreshed when a task runs) instead of being rebuilt
+# and fully sorted every tick.
+_STATIC_KEYS = {
+    "Rate Monotonic": lambda x: x.period,
+    # Shortest relative deadline (D), not the computed abs_deadline
+    "Deadline Monotonic": lambda x: x.deadline,
+    # Earliest absolute deadline (d); constant for the lifetime of a job
+    "EDF": lambda x: x.abs_deadline,
+    # Laxity is d - t - remaining, but t is common to every ready task at a
+    # comparison point, so d - remaining ranks identically — and it only
+    # moves when the task actually runs, which is exactly when its heap
+    # entry gets re-pushed anyway
+    "Least Laxity First": lambda x: x.abs_deadline - x.remaining_time,
+}
 
 class Task:
+    # No per-instance __dict__: one of these is created per job release, and
+    # the scheduler loop reads these attributes every tick
+    __slots__ = ('name', 'type', 'arrival_time', 'cost', 'period', 'deadline',
+                 'remaining_time', 'abs_deadline')
+
     def __init__(self, name, task_type, cost, period=0, deadline=0, arrival=0):
         self.name = name
         self.type = task_type  # "Periodic" or "Aperiodic"
@@ -20,153 +47,377 @@ class Task:
         self.remaining_time = 0     
         self.abs_deadline = 0      
 
-def _lcm(a, b):
-    return abs(a * b) // math.gcd(a, b)
+@lru_cache(maxsize=128)
+def _hyperperiod_cached(periods):
+    # periods is a sorted tuple so permutations of the same task set share
+    # one cache slot
+    return math.lcm(*periods)
+
+# Coprime periods can push the LCM into the millions, silently turning the
+# simulator into a memory/time sink; past this many ticks the schedule is
+# clamped (enough horizon for schedulability inspection at this scale)
+MAX_SIM_TICKS = 10000
 
-def calculate_hyperperiod(tasks):
+def calculate_hyperperiod(tasks, max_ticks=MAX_SIM_TICKS):
     periodic_tasks = [t for t in tasks if t.type == "Periodic"]
     if not periodic_tasks: return 20
-    periods = [t.period for t in periodic_tasks]
-    h = reduce(_lcm, periods)
+    h = _hyperperiod_cached(tuple(sorted(t.period for t in periodic_tasks)))
     max_offset = max([t.arrival_time for t in tasks]) if tasks else 0
-    return max_offset + h
+    horizon = max_offset + h
+    if max_ticks is not None and horizon > max_ticks:
+        warnings.warn(
+            f"hyperperiod {horizon} exceeds {max_ticks} ticks; simulation clamped "
+            f"(pass max_ticks=None for the full horizon)",
+            stacklevel=2,
+        )
+        return max_ticks
+    return horizon
+
+def _fresh_jobs(tasks):
+    # The simulation only mutates remaining_time/abs_deadline, so plain
+    # re-constructed copies replace deepcopy's recursive reduce machinery.
+    # Runtime state carries over exactly as deepcopy's did — a caller that
+    # arms an aperiodic job by pre-setting remaining_time keeps that.
+    jobs = []
+    for task in tasks:
+        job = Task(task.name, task.type, task.cost, task.period, task.deadline, task.arrival_time)
+        job.remaining_time = task.remaining_time
+        job.abs_deadline = task.abs_deadline
+        jobs.append(job)
+    return jobs
+
+def _run_fast_uniproc(active_periodic, algorithm, hyperperiod, log_queue=True):
+    # Fast path for one CPU and no aperiodic load: the whole tick body is a
+    # few NumPy ops over task arrays (release mask, argmin winner pick)
+    # instead of heap/queue bookkeeping. Produces the exact same timeline
+    # and queue log as the general loop.
+    n = len(active_periodic)
+    names = [task.name for task in active_periodic]
+    arrival = np.array([task.arrival_time for task in active_periodic], dtype=np.int64)
+    period = np.array([task.period for task in active_periodic], dtype=np.int64)
+    rel_deadline = np.array([task.deadline for task in active_periodic], dtype=np.int64)
+    cost = np.array([task.cost for task in active_periodic], dtype=np.int64)
+    remaining = np.zeros(n, dtype=np.int64)
+    abs_deadline = np.zeros(n, dtype=np.int64)
+
+    # Priority key per algorithm. EDF references abs_deadline, which is
+    # updated in place on release; LLF's laxity shifts with t for everyone
+    # equally, so abs_deadline - remaining ranks identically and is the only
+    # key that must be recomputed (it changes when the running task ticks).
+    dynamic_llf = algorithm == "Least Laxity First"
+    if algorithm == "Deadline Monotonic":
+        base_key = rel_deadline
+    elif algorithm == "EDF":
+        base_key = abs_deadline
+    else:  # Rate Monotonic (and the LLF placeholder)
+        base_key = period
+
+    INACTIVE = np.iinfo(np.int64).max
+
+    timeline = []
+    queue_log = []
+    last_slot = None
+
+    for t in range(hyperperiod):
+        # Releases (same semantics as section B of the general loop)
+        shift = t - arrival
+        for i in np.flatnonzero((shift >= 0) & (shift % period == 0)):
+            if remaining[i] > 0 and t > arrival[i]:
+                timeline.append(dict(Task=names[i], Start=t, Finish=t, Duration=0, Status="Missed", CPU="Err"))
+            remaining[i] = cost[i]
+            abs_deadline[i] = t + rel_deadline[i]
+
+        key = abs_deadline - remaining if dynamic_llf else base_key
+        masked = np.where(remaining > 0, key, INACTIVE)
+
+        runner = int(np.argmin(masked)) if n else -1
+        if runner >= 0 and masked[runner] != INACTIVE:
+            slot_name, slot_status = names[runner], "Running"
+            remaining[runner] -= 1
+        else:
+            runner = -1
+            slot_name, slot_status = "IDLE", "Idle"
+
+        # Run-length merge: extend the previous slot if the CPU kept doing
+        # the same thing, mirroring the general loop's timeline compression
+        if last_slot is not None and last_slot['Finish'] == t and last_slot['Task'] == slot_name and last_slot['Status'] == slot_status:
+            last_slot['Finish'] = t + 1
+            last_slot['Duration'] += 1
+        else:
+            last_slot = dict(Task=slot_name, Start=t, Finish=t+1, Duration=1, Status=slot_status, CPU="CPU 1")
+            timeline.append(last_slot)
+
+        if log_queue:
+            # Waiting queue in priority order (stable sort keeps index ties
+            # in input order, like the general loop)
+            waiting_list = [names[i] for i in np.argsort(masked, kind='stable')
+                            if masked[i] != INACTIVE and i != runner]
+            queue_log.append({"Time": t, "CPU 1": slot_name,
+                              "Waiting Queue": str(waiting_list) if waiting_list else "Empty"})
+
+    return timeline, queue_log
+
+def run_scheduler(periodic_tasks, aperiodic_tasks, algorithm, num_cpus, server_type=None, server_capacity=0, server_period=0, max_time=None, log_queue=True):
 
-def run_scheduler(periodic_tasks, aperiodic_tasks, algorithm, num_cpus, server_type=None, server_capacity=0, server_period=0):
-    
     # 1. SETUP
     hyperperiod = calculate_hyperperiod(periodic_tasks)
-    active_periodic = copy.deepcopy(periodic_tasks)
-    aperiodic_queue = copy.deepcopy(aperiodic_tasks)
-    
+    if max_time is not None:
+        hyperperiod = min(hyperperiod, max_time)
+    active_periodic = _fresh_jobs(periodic_tasks)
+    aperiodic_queue = _fresh_jobs(aperiodic_tasks)
+
+    # Common case: one CPU, purely periodic load. The server never gets
+    # work without aperiodic jobs, so the vectorized path covers it.
+    if num_cpus == 1 and not aperiodic_queue:
+        return _run_fast_uniproc(active_periodic, algorithm, hyperperiod, log_queue)
+
+
     server_budget = server_capacity
     server_deadline = server_period
-    
-    timeline = [] 
+
+    timeline = []
     queue_log = [] # <--- Stores row-by-row data for the table
 
+    # Run-length merge at write time: when a CPU keeps doing the same thing
+    # in consecutive ticks, extend its last timeline entry instead of
+    # appending a new 1-tick one. Shrinks the timeline from H*C entries to
+    # the number of preemption points.
+    last_per_cpu = [None] * num_cpus
+
+    def _log_slot(cpu_idx, cpu_label, name, status):
+        last = last_per_cpu[cpu_idx]
+        if last is not None and last['Finish'] == t and last['Task'] == name and last['Status'] == status:
+            last['Finish'] = t + 1
+            last['Duration'] += 1
+        else:
+            entry = dict(Task=name, Start=t, Finish=t+1, Duration=1, Status=status, CPU=cpu_label)
+            timeline.append(entry)
+            last_per_cpu[cpu_idx] = entry
+
+    # --- READY QUEUE (heap with lazy deletion) ---
+    # Entries are [key, order, seq, task]: 'order' is the task's position in
+    # the input list so priority ties resolve exactly like the old stable
+    # sort did, 'seq' just keeps comparisons away from the Task objects.
+    # Superseded entries are voided in place (task slot set to None) and
+    # skipped when popped.
+    # Unrecognized algorithm names fall back to the laxity key, matching the
+    # old catch-all laxity sort
+    key_fn = _STATIC_KEYS.get(algorithm, _STATIC_KEYS["Least Laxity First"])
+    # Mode flags resolved once: the tick loop branches on plain bools instead
+    # of re-running string comparisons H times
+    deferrable = server_type == "Deferrable Server"
+    background = server_type == "Background"
+    # One server job for the whole run: its static fields never change, so
+    # only abs_deadline is refreshed on the ticks it competes
+    server_job = Task("Server", "Server", 1, server_period, server_period) if deferrable else None
+    ready_heap = []
+    heap_entry = {}  # task -> its live heap entry
+    heap_seq = count()
+    task_order = {task: i for i, task in enumerate(active_periodic)}
+
+    # Precomputed release schedule: every (tick, task index) release event,
+    # generated per task with arange and merged in time order (stable sort
+    # keeps simultaneous releases in task input order). The tick loop then
+    # consumes events with a cursor — O(total releases) instead of H*n
+    # modulo tests.
+    arrival_arr = np.array([task.arrival_time for task in active_periodic], dtype=np.int64)
+    period_arr = np.array([task.period for task in active_periodic], dtype=np.int64)
+    release_sched = []
+    if len(active_periodic):
+        per_task_ticks = [np.arange(a, hyperperiod, p, dtype=np.int64)
+                          for a, p in zip(arrival_arr, period_arr)]
+        all_ticks = np.concatenate(per_task_ticks)
+        all_tasks = np.concatenate([np.full(len(ticks), i, dtype=np.int64)
+                                    for i, ticks in enumerate(per_task_ticks)])
+        order_by_tick = np.argsort(all_ticks, kind='stable')
+        release_sched = list(zip(all_ticks[order_by_tick].tolist(),
+                                 all_tasks[order_by_tick].tolist()))
+    release_cursor = 0
+    n_releases = len(release_sched)
+
+    # Aperiodic arrivals are likewise consumed with a cursor: jobs are
+    # walked in arrival order and insorted into ready_aperiodic by input
+    # position, so the list stays identical to what the old per-tick scan of
+    # aperiodic_queue produced — without rescanning it every tick.
+    ap_order = {task: i for i, task in enumerate(aperiodic_queue)}
+    ap_by_arrival = sorted(aperiodic_queue, key=lambda x: x.arrival_time)
+    ap_cursor = 0
+    n_ap = len(ap_by_arrival)
+    ready_aperiodic = []   # arrived jobs with work left, in input order
+    ready_ap_orders = []   # parallel input positions, kept for bisect
+
+    def _retire_aperiodic(task):
+        pos = bisect_left(ready_ap_orders, ap_order[task])
+        del ready_ap_orders[pos]
+        del ready_aperiodic[pos]
+
+    def _push_ready(task, order):
+        old = heap_entry.get(task)
+        if old is not None:
+            old[3] = None
+        entry = [key_fn(task), order, next(heap_seq), task]
+        heap_entry[task] = entry
+        heapq.heappush(ready_heap, entry)
+
+    def _pop_ready():
+        while ready_heap:
+            entry = heapq.heappop(ready_heap)
+            task = entry[3]
+            if task is None:
+                continue
+            if heap_entry.get(task) is entry:
+                del heap_entry[task]
+            # remaining_time tests for a finished job, but the server drains
+            # the aperiodic job's remaining (never its own, which stays 0),
+            # so it is exempt from the staleness check
+            if task.remaining_time > 0 or task is server_job:
+                return task
+        return None
+
+    def _discard_ready(task):
+        entry = heap_entry.pop(task, None)
+        if entry is not None:
+            entry[3] = None
+
     # 2. SIMULATION LOOP
     for t in range(hyperperiod):
-        
+
         # --- A. SERVER REPLENISHMENT ---
-        if server_type == "Deferrable Server":
+        if deferrable:
             if t % server_period == 0:
                 server_budget = server_capacity
                 server_deadline = t + server_period
 
         # --- B. PERIODIC ARRIVALS ---
-        for task in active_periodic:
-            time_since_release = t - task.arrival_time
-            if t >= task.arrival_time and (time_since_release % task.period == 0):
-                if task.remaining_time > 0 and t > task.arrival_time:
-                    timeline.append(dict(Task=task.name, Start=t, Finish=t, Status="Missed", CPU="Err"))
-                task.remaining_time = task.cost
-                task.abs_deadline = t + task.deadline
+        # Consume this tick's precomputed release events
+        while release_cursor < n_releases and release_sched[release_cursor][0] == t:
+            i = release_sched[release_cursor][1]
+            release_cursor += 1
+            task = active_periodic[i]
+            if task.remaining_time > 0 and t > task.arrival_time:
+                timeline.append(dict(Task=task.name, Start=t, Finish=t, Duration=0, Status="Missed", CPU="Err"))
+            task.remaining_time = task.cost
+            task.abs_deadline = t + task.deadline
+            # (Re-)queue the released job; a pending entry from an
+            # unfinished previous job is voided by the push
+            _push_ready(task, i)
 
         # --- C. APERIODIC ARRIVALS ---
-        # Get tasks that have arrived (Arrival <= t) and are not finished
-        ready_aperiodic = [at for at in aperiodic_queue if at.arrival_time <= t and at.remaining_time > 0]
-
-        # --- D. BUILD GLOBAL READY QUEUE (Periodic + Server) ---
-        global_ready_queue = []
-        for pt in active_periodic:
-            if pt.remaining_time > 0:
-                global_ready_queue.append(pt)
-        
-        if server_type == "Deferrable Server":
+        # Admit jobs whose arrival has passed and that have work left
+        while ap_cursor < n_ap and ap_by_arrival[ap_cursor].arrival_time <= t:
+            at = ap_by_arrival[ap_cursor]
+            ap_cursor += 1
+            if at.remaining_time > 0:
+                pos = bisect_left(ready_ap_orders, ap_order[at])
+                ready_ap_orders.insert(pos, ap_order[at])
+                ready_aperiodic.insert(pos, at)
+
+        # --- D. READY QUEUE (Periodic + Server) ---
+        server_task = None
+        if deferrable:
             if server_budget > 0 and ready_aperiodic:
-                server_task = Task("Server", "Server", 1, server_period, server_period)
-                server_task.abs_deadline = server_deadline 
-                global_ready_queue.append(server_task)
+                server_task = server_job
+                server_task.abs_deadline = server_deadline
 
-        # --- E. SORTING ---
-        if algorithm == "Rate Monotonic":
-            global_ready_queue.sort(key=lambda x: x.period)
-            
-        elif algorithm == "Deadline Monotonic":
-            # Priority: Shortest Relative Deadline (D)
-            # This uses the static 'deadline' attribute, not the calculated 'abs_deadline'
-            global_ready_queue.sort(key=lambda x: x.deadline)
-
-        elif algorithm == "EDF":
-            # Priority: Earliest Absolute Deadline (d)
-            global_ready_queue.sort(key=lambda x: x.abs_deadline)
-            
-        elif algorithm == "Least Laxity First":
-            # Priority: Least Laxity
-            # Laxity = (Time until deadline) - (Work remaining)
-            # Formula: (x.abs_deadline - t) - x.remaining_time
-            global_ready_queue.sort(key=lambda x: (x.abs_deadline - t - x.remaining_time))
+        # Periodic jobs were pushed on arrival; only the server entry is
+        # per-tick (it competes just while budget and work exist)
+        if server_task is not None:
+            _push_ready(server_task, len(active_periodic))
 
         # --- F. EXECUTION & LOGGING PREP ---
         cpus_assigned = 0
-        execution_candidates = global_ready_queue[:]
-        
-        # Create a log entry for this timestamp
-        log_entry = {"Time": t}
-        running_tasks_this_tick = []
+        runners = []  # popped jobs to re-queue once the tick is logged
+
+        # Create a log entry for this timestamp (skipped entirely when the
+        # caller only wants the timeline)
+        log_entry = {"Time": t} if log_queue else None
+        running_tasks_this_tick = set()  # membership-only; O(1) checks below
 
         while cpus_assigned < num_cpus:
             cpu_label = f"CPU {cpus_assigned + 1}"
-            
-            if execution_candidates:
-                task_to_run = execution_candidates.pop(0)
-                
+
+            task_to_run = _pop_ready()
+            if task_to_run is not None and task_to_run is not server_task:
+                runners.append(task_to_run)
+
+            if task_to_run is not None:
                 # Logic for Server Execution
                 if task_to_run.name == "Server":
                     target_aperiodic = ready_aperiodic[0]
-                    timeline.append(dict(Task=target_aperiodic.name, Start=t, Finish=t+1, Status="Server Exec", CPU=cpu_label))
+                    _log_slot(cpus_assigned, cpu_label, target_aperiodic.name, "Server Exec")
                     
                     # Log real name
-                    log_entry[cpu_label] = f"Server({target_aperiodic.name})"
-                    running_tasks_this_tick.append(target_aperiodic.name)
+                    if log_queue:
+                        log_entry[cpu_label] = f"Server({target_aperiodic.name})"
+                    running_tasks_this_tick.add(target_aperiodic.name)
                     
                     target_aperiodic.remaining_time -= 1
                     server_budget -= 1
+                    if target_aperiodic.remaining_time == 0:
+                        _retire_aperiodic(target_aperiodic)
                 else:
                     # Logic for Periodic Execution
-                    timeline.append(dict(Task=task_to_run.name, Start=t, Finish=t+1, Status="Running", CPU=cpu_label))
-                    
-                    log_entry[cpu_label] = task_to_run.name
-                    running_tasks_this_tick.append(task_to_run.name)
+                    _log_slot(cpus_assigned, cpu_label, task_to_run.name, "Running")
                     
+                    if log_queue:
+                        log_entry[cpu_label] = task_to_run.name
+                    running_tasks_this_tick.add(task_to_run.name)
+
                     task_to_run.remaining_time -= 1
             else:
                 # Logic for Background Execution
-                if server_type == "Background" and ready_aperiodic:
+                if background and ready_aperiodic:
                     # Find first aperiodic task that is NOT already running on another CPU
                     available_ap = [ap for ap in ready_aperiodic if ap.name not in running_tasks_this_tick]
                     
                     if available_ap:
                         bg_task = available_ap[0]
-                        timeline.append(dict(Task=bg_task.name, Start=t, Finish=t+1, Status="Background", CPU=cpu_label))
+                        _log_slot(cpus_assigned, cpu_label, bg_task.name, "Background")
                         
-                        log_entry[cpu_label] = f"{bg_task.name}(BG)"
-                        running_tasks_this_tick.append(bg_task.name)
+                        if log_queue:
+                            log_entry[cpu_label] = f"{bg_task.name}(BG)"
+                        running_tasks_this_tick.add(bg_task.name)
                         
                         bg_task.remaining_time -= 1
+                        if bg_task.remaining_time == 0:
+                            _retire_aperiodic(bg_task)
                     else:
-                        timeline.append(dict(Task="IDLE", Start=t, Finish=t+1, Status="Idle", CPU=cpu_label))
-                        log_entry[cpu_label] = "IDLE"
+                        _log_slot(cpus_assigned, cpu_label, "IDLE", "Idle")
+                        if log_queue:
+                            log_entry[cpu_label] = "IDLE"
                 else:
-                    timeline.append(dict(Task="IDLE", Start=t, Finish=t+1, Status="Idle", CPU=cpu_label))
-                    log_entry[cpu_label] = "IDLE"
+                    _log_slot(cpus_assigned, cpu_label, "IDLE", "Idle")
+                    if log_queue:
+                        log_entry[cpu_label] = "IDLE"
             
             cpus_assigned += 1
 
         # --- G. CALCULATE WAITING QUEUE ---
-        waiting_list = []
-        
-        # 1. Periodic tasks still in execution_candidates (not picked by any CPU)
-        for tsk in execution_candidates:
-            waiting_list.append(tsk.name)
-            
-        # 2. Aperiodic tasks that are ready but NOT in the running list
-        for ap in ready_aperiodic:
-            if ap.name not in running_tasks_this_tick:
-                waiting_list.append(f"{ap.name}(AP)")
-        
-        log_entry["Waiting Queue"] = str(waiting_list) if waiting_list else "Empty"
-        
-        queue_log.append(log_entry)
+        if log_queue:
+            waiting_list = []
+
+            # 1. Ready tasks not picked by any CPU, in priority order
+            for entry in sorted(ready_heap):
+                tsk = entry[3]
+                if tsk is not None and (tsk.remaining_time > 0 or tsk is server_job):
+                    waiting_list.append(tsk.name)
+
+            # 2. Aperiodic tasks that are ready but NOT in the running list
+            for ap in ready_aperiodic:
+                if ap.name not in running_tasks_this_tick:
+                    waiting_list.append(f"{ap.name}(AP)")
+
+            log_entry["Waiting Queue"] = str(waiting_list) if waiting_list else "Empty"
+
+            queue_log.append(log_entry)
+
+        # Re-queue the jobs that ran and still have work left (with a fresh
+        # key — for LLF, running is the one thing that shifts a task's rank);
+        # the server entry never carries over to the next tick
+        for tsk in runners:
+            if tsk.remaining_time > 0:
+                _push_ready(tsk, task_order[tsk])
+        if server_task is not None:
+            _discard_ready(server_task)
 
     return timeline, queue_log
\ No newline at end of file
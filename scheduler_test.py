@@ -0,0 +1,33 @@
+"""Sanity checks for run_scheduler (run directly or with pytest)."""
+from scheduler import Task, run_scheduler
+
+
+def _armed_job(name, cost, arrival):
+    job = Task(name, "Aperiodic", cost, arrival=arrival)
+    job.remaining_time = cost
+    return job
+
+
+def test_deferrable_server_executes_armed_aperiodic():
+    # The server must win a CPU and drain the aperiodic job even though its
+    # own remaining_time stays 0 — guards the heap's lazy-deletion check
+    periodic = [Task("T1", "Periodic", 1, 4)]
+    timeline, queue_log = run_scheduler(
+        periodic, [_armed_job("J1", 2, 0)], "EDF", 1, "Deferrable Server", 2, 5)
+    served = [e for e in timeline if e["Status"] == "Server Exec"]
+    assert sum(e["Duration"] for e in served) == 2
+    assert all(e["Task"] == "J1" for e in served)
+
+
+def test_background_runs_armed_aperiodic_in_idle_time():
+    periodic = [Task("T1", "Periodic", 1, 4)]
+    timeline, _ = run_scheduler(
+        periodic, [_armed_job("J1", 2, 0)], "Rate Monotonic", 1, "Background")
+    bg = [e for e in timeline if e["Status"] == "Background"]
+    assert sum(e["Duration"] for e in bg) == 2
+
+
+if __name__ == "__main__":
+    test_deferrable_server_executes_armed_aperiodic()
+    test_background_runs_armed_aperiodic_in_idle_time()
+    print("ok")